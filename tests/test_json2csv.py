@@ -0,0 +1,310 @@
+"""Tests for json2csv's fast paths, checked against plain conversion."""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / 'json2csv.py'
+
+sys.path.insert(0, str(ROOT))
+import json2csv  # noqa: E402
+
+
+def run(*args, stdin=None, input=None, env=None):
+    """Run json2csv.py with the given arguments and return the finished process."""
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *map(str, args)],
+        stdin=stdin,
+        input=input,
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+
+def flatten(obj, list_handling='join', join_string='|', prefix=''):
+    """Flatten a record the plain recursive way, as a reference for the fast paths."""
+    flattened = {}
+
+    for key, value in obj.items():
+        new_key = f"{prefix}.{key}" if prefix else key
+
+        if isinstance(value, dict):
+            flattened.update(flatten(value, list_handling, join_string, new_key))
+        elif isinstance(value, list):
+            if list_handling == 'join':
+                flattened[new_key] = join_string.join(str(v) for v in value)
+            else:
+                for i, item in enumerate(value):
+                    flattened[f"{new_key}.{i}"] = item
+        else:
+            flattened[new_key] = value
+
+    return flattened
+
+
+def expected_csv(records, fieldnames=None, list_handling='join'):
+    """Write records flattened by the reference, in the first record's columns by default."""
+    flattened = [flatten(record, list_handling) if isinstance(record, dict) else {'value': record}
+                 for record in records]
+    fieldnames = fieldnames or list(flattened[0])
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(fieldnames)
+    for record in flattened:
+        writer.writerow([record.get(field) for field in fieldnames])
+
+    return output.getvalue()
+
+
+def convert(records, **options):
+    """Convert records, given as a JSON array, in process and return the CSV text."""
+    output = io.StringIO()
+    converter = json2csv.JSONToCSVConverter(**options)
+    converter.convert(io.BytesIO(json.dumps(records).encode()), output)
+    return output.getvalue()
+
+
+def make_records(count):
+    """Build NDJSON records with nested objects, lists and an occasional extra field."""
+    for i in range(count):
+        record = {
+            'id': i,
+            'name': f'user{i}',
+            'profile': {'city': ['NY', 'Paris, FR', 'Q"t'][i % 3], 'bio': 'a\nb' if i % 50 == 0 else 'hi'},
+            'tags': ['x', str(i % 7)],
+        }
+        if i % 997 == 3:
+            record['extra'] = i
+        yield json.dumps(record)
+
+
+@pytest.fixture(scope='module')
+def ndjson_file(tmp_path_factory):
+    """An NDJSON file spanning several parallel chunks."""
+    path = tmp_path_factory.mktemp('data') / 'big.ndjson'
+    lines = []
+    size = 0
+    for line in make_records(10 ** 6):
+        lines.append(line)
+        size += len(line) + 1
+        if size > 2.5 * json2csv.PARALLEL_CHUNK_SIZE:
+            break
+
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+@pytest.mark.parametrize('options', [
+    [],
+    ['--fields', 'profile.city,id,missing'],
+    ['--fast-ndjson'],
+    ['--list-handling', 'index'],
+])
+def test_jobs_matches_single_process(ndjson_file, options):
+    single = run(*options, ndjson_file)
+    parallel = run('--jobs', 3, *options, ndjson_file)
+
+    assert single.returncode == 0, single.stderr
+    assert parallel.returncode == 0, parallel.stderr
+    assert parallel.stdout == single.stdout
+
+
+def test_jobs_with_stdin_redirected_from_file(ndjson_file):
+    single = run(ndjson_file)
+    with open(ndjson_file, 'rb') as stdin:
+        parallel = run('--jobs', 3, stdin=stdin)
+
+    assert parallel.returncode == 0, parallel.stderr
+    assert parallel.stdout == single.stdout
+
+
+def test_jobs_reports_bad_line_in_later_chunk(ndjson_file, tmp_path):
+    lines = ndjson_file.read_text().splitlines()
+    bad_line_num = len(lines) - 5
+    lines[bad_line_num - 1] = '{bad'
+    path = tmp_path / 'bad.ndjson'
+    path.write_text('\n'.join(lines) + '\n')
+
+    single = run(path)
+    parallel = run('--jobs', 3, path)
+
+    assert single.returncode == 1
+    assert parallel.returncode == 1
+    assert parallel.stderr.startswith(f'Error: Line {bad_line_num}: Invalid JSON')
+    assert parallel.stderr == single.stderr
+
+
+def test_jobs_starts_from_current_position(ndjson_file):
+    with open(ndjson_file, 'rb') as f:
+        expected_lines = f.read().splitlines()[2:]
+
+    with open(ndjson_file, 'rb') as f:
+        f.readline()
+        f.readline()
+        converter = json2csv.JSONToCSVConverter(fields=['id'], jobs=3)
+        output = io.StringIO()
+        converter.convert(f, output)
+
+    ids = output.getvalue().split()
+    assert ids[0] == 'id'
+    assert ids[1:] == [str(json.loads(line)['id']) for line in expected_lines]
+
+
+@pytest.mark.parametrize('jobs', ['0', '-3'])
+def test_jobs_rejects_values_below_one(jobs):
+    result = run('--jobs', jobs, SCRIPT)
+
+    assert 'must be at least 1' in result.stderr
+    assert result.stdout == ''
+
+
+FIRST = {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']}
+
+
+@pytest.mark.parametrize('record', [
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q'], 'extra': 3},
+    {'a': 1, 'b': {'c': 2, 'd': 'x', 'e': 4}, 'tags': ['p', 'q']},
+    {'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': 1, 'b': {'c': 2}, 'tags': ['p', 'q']},
+    {'a': 1, 'b': {'c': 2, 'dd': 'x'}, 'tags': ['p', 'q']},
+    {'a': {'z': 1}, 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': [1, 2], 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': 1, 'b': 'flat', 'tags': ['p', 'q']},
+    {'a': 1, 'b': [2, 'x'], 'tags': ['p', 'q']},
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': 'p|q'},
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': {'0': 'p'}},
+])
+def test_compiled_row_rejects_differently_shaped_record(record):
+    converter = json2csv.JSONToCSVConverter()
+    _, row = converter._compile_row_function(FIRST)
+
+    with pytest.raises((json2csv._SchemaMismatch, KeyError)):
+        row(record)
+
+
+@pytest.mark.parametrize('record', [
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q'], 'extra': 3},
+    {'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': 1, 'b': {'c': 2}, 'tags': ['p', 'q']},
+    {'a': {'z': 1}, 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': [1, 2], 'b': {'c': 2, 'd': 'x'}, 'tags': ['p', 'q']},
+    {'a': 1, 'b': 'flat', 'tags': ['p', 'q']},
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': 'p|q'},
+    {'a': 1, 'b': {'c': 2, 'd': 'x'}, 'tags': []},
+])
+def test_fast_ndjson_falls_back_for_differently_shaped_record(record):
+    records = [FIRST, record, FIRST]
+
+    assert convert(records, fast_ndjson=True) == expected_csv(records)
+
+
+@pytest.mark.parametrize('tags', [[], ['p'], ['p', 'q', 'r'], 'p', {'0': 'p', '1': 'q'}])
+def test_fast_ndjson_index_mode_falls_back_for_other_list_lengths(tags):
+    records = [FIRST, {**FIRST, 'tags': tags}, FIRST]
+
+    result = convert(records, fast_ndjson=True, list_handling='index')
+    assert result == expected_csv(records, list_handling='index')
+
+
+def test_fast_ndjson_with_non_object_first_record():
+    records = [1, {'value': 2}, 'x', {'value': {'n': 3}}, None, [4, 5]]
+
+    assert convert(records, fast_ndjson=True) == expected_csv(records)
+
+
+def test_fast_ndjson_with_fields_naming_non_leaves():
+    fields = ['b', 'b.c', 'nope', 'a']
+    records = [FIRST, {'a': 1, 'b': 5}, {'a': {'b': 1}, 'b': {'c': {'d': 2}}}, FIRST]
+
+    assert convert(records, fast_ndjson=True, fields=fields) == expected_csv(records, fields)
+
+
+def test_fast_ndjson_with_keys_needing_quotes():
+    first = {"it's": 1, 'q"uote': 2, 'back\\slash': 3, 'new\nline': 4, 'a.b': 5, '': 6,
+             "x'y": {'z"': 7, '\t': [8, 9]}, 'a': {'b': 10}}
+    records = [first, {**first, 'new\nline': {'deep': 11}}, first]
+
+    assert convert(records, fast_ndjson=True) == expected_csv(records)
+    assert convert(records, fast_ndjson=True, list_handling='index') == \
+        expected_csv(records, list_handling='index')
+
+
+NESTED = [
+    {'a': {'b': {'c': 1, 'x': 2}, 'd': [3, 4], 'e': 5}, 'tags': ['p', 'q'], 'z': 6},
+    {'a': {'b': {'c': {'deep': 7}}, 'd': 'flat'}, 'tags': [], 'z': None},
+    {'a': 'scalar', 'tags': ['r']},
+    {'a.b': {'c': 8}, 'a': {'b': {'c': 9}}, 'tags': 'p|q'},
+    {'a': {'b.c': 10, 'b': {'c': 11}}},
+    {'a.b.c': 12, 'tags': [{'k': 1}, ['n']]},
+    {},
+]
+
+
+@pytest.mark.parametrize('fields', [
+    ['a.b.c', 'a.d'],
+    ['a'],
+    ['a.b'],
+    ['a.b.c'],
+    ['tags', 'z', 'a.e', 'missing.leaf'],
+])
+def test_fields_prune_like_plain_flattening(fields):
+    assert convert(NESTED, fields=fields) == expected_csv(NESTED, fields)
+
+
+@pytest.mark.parametrize('fields', [
+    ['tags.0'],
+    ['tags.1', 'tags', 'a.d.0'],
+    ['a.b.c.deep', 'tags.0.k'],
+])
+def test_fields_prune_like_plain_flattening_with_index_lists(fields):
+    result = convert(NESTED, fields=fields, list_handling='index')
+    assert result == expected_csv(NESTED, fields, list_handling='index')
+
+
+@pytest.fixture(scope='module')
+def orjson_env(tmp_path_factory):
+    """Environment in which json2csv falls back to orjson because simdjson cannot be imported."""
+    pytest.importorskip('orjson')
+
+    path = tmp_path_factory.mktemp('no_simdjson')
+    (path / 'simdjson.py').write_text('raise ImportError("blocked for testing")\n')
+    env = {**os.environ, 'PYTHONPATH': str(path)}
+
+    check = subprocess.run(
+        [sys.executable, '-c', 'import json2csv; print(json2csv.simdjson, json2csv.orjson is None)'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    assert check.stdout.split() == ['None', 'False'], check.stderr
+    return env
+
+
+LARGE_NUMBERS = ['123456789012345678901234567890', '-9223372036854775809', '9223372036854775807',
+                 '18446744073709551615', '-9223372036854775808', '12', 'NaN']
+
+
+@pytest.mark.parametrize('document', [False, True])
+@pytest.mark.parametrize('source', ['stdin', 'file'])
+def test_orjson_keeps_large_integers_and_nan(orjson_env, tmp_path, document, source):
+    if document:
+        text = '[' + ', '.join(f'{{"a": {number}}}' for number in LARGE_NUMBERS) + ']'
+    else:
+        text = ''.join(f'{{"a": {number}}}\n' for number in LARGE_NUMBERS)
+
+    if source == 'file':
+        path = tmp_path / 'numbers.json'
+        path.write_text(text)
+        result = run(path, env=orjson_env)
+    else:
+        result = run(input=text, env=orjson_env)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split('\n') == ['a', *LARGE_NUMBERS[:-1], 'nan', '']